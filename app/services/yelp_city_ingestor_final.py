@@ -1,37 +1,139 @@
 # ZIP-first City Batch Ingestion System - Production Ready
+import asyncio
+import hashlib
+import json
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+
+import aiohttp
+from aiolimiter import AsyncLimiter
+
+# Shared immutable default for list-valued fields, so extraction never
+# allocates a throwaway empty list per call
+_EMPTY = ()
+
+
+def _extract_restaurant_data(business: Dict[str, Any], zip_code: str, ingested_at: str) -> Dict[str, Any]:
+    """Extract and structure restaurant data from Yelp business object.
+
+    Module-level (not a method) so batches can be shipped to
+    ProcessPoolExecutor workers, which require picklable callables.
+
+    Args:
+        business: Raw business data from Yelp API
+        zip_code: The ZIP code being processed (for validation)
+        ingested_at: ISO timestamp shared by all businesses in the batch
+
+    Returns:
+        Structured restaurant data dict
+    """
+    # Bind the lookups once; this function runs once per restaurant, so the
+    # dozen repeated business.get attribute resolutions add up
+    bget = business.get
+    lget = (bget('location') or {}).get
+    cget = (bget('coordinates') or {}).get
+
+    return {
+        'yelp_id': bget('id'),
+        'name': bget('name'),
+        'address': lget('address1'),
+        'city': lget('city'),
+        'state': lget('state'),
+        'zip_code': zip_code,  # Use the target ZIP to ensure consistency
+        'latitude': cget('latitude'),
+        'longitude': cget('longitude'),
+        'phone': bget('phone'),
+        'rating': bget('rating'),
+        'review_count': bget('review_count'),
+        'price': bget('price'),
+        'categories': [alias for cat in bget('categories', _EMPTY) if (alias := cat.get('alias'))],
+        'image_url': bget('image_url'),
+        'url': bget('url'),
+        'is_closed': bget('is_closed', False),
+        'transactions': bget('transactions', _EMPTY),
+        'ingested_at': ingested_at
+    }
+
+
+def _extract_zip_batch(businesses: List[Dict[str, Any]], zip_code: str, ingested_at: str) -> List[Dict[str, Any]]:
+    """Extract every business in a response batch that is actually in the target ZIP.
+
+    Args:
+        businesses: The businesses list from one search response
+        zip_code: The ZIP code being processed (strict matching)
+        ingested_at: ISO timestamp shared by the whole batch
+
+    Returns:
+        List of structured restaurant data dicts
+    """
+    return [
+        _extract_restaurant_data(business, zip_code, ingested_at)
+        for business in businesses
+        if (business.get('location') or {}).get('zip_code', '') == zip_code
+    ]
 
 class YelpService:
     """Stub service class that safely logs restaurant storage without assuming schema or DB structure."""
-    
-    def __init__(self, logger: Optional[logging.Logger] = None):
+
+    # Rows buffered before a batch insert is flushed to the database
+    FLUSH_BATCH_SIZE = 500
+
+    def __init__(self, logger: Optional[logging.Logger] = None, session: Optional[aiohttp.ClientSession] = None):
         self.logger = logger or logging.getLogger(__name__)
         self.stored_count = 0
-    
-    def search_businesses(self, **params) -> Dict[str, Any]:
+        self.session = session
+        self._buffer: List[Dict[str, Any]] = []
+
+    async def search_businesses(self, **params) -> Dict[str, Any]:
         """Stub method for Yelp API search - would be replaced with actual API implementation."""
-        self.logger.info(f"[SEARCH] Searching with params: {params}")
-        # This would be replaced with actual Yelp API call
+        self.logger.debug("[SEARCH] Searching with params: %s", params)
+        # This would be replaced with an actual Yelp API call, e.g.:
+        #     async with self.session.get(SEARCH_URL, params=params) as response:
+        #         return await response.json()
         # For now, return empty response to avoid assumptions
         return {'businesses': [], 'total': 0}
-    
+
     def store_restaurant(self, restaurant_data: Dict[str, Any]) -> None:
-        """Stub method to safely log restaurant storage without assuming schema or DB structure."""
+        """Buffer a restaurant for batch storage, flushing every FLUSH_BATCH_SIZE rows."""
         self.stored_count += 1
-        self.logger.info(
-            f"[STORE] Would store restaurant #{self.stored_count}: "
-            f"{restaurant_data.get('name', '[unknown]')} at ZIP {restaurant_data.get('zip_code')} "
-            f"(Yelp ID: {restaurant_data.get('yelp_id', 'N/A')})"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "[STORE] Would store restaurant #%d: %s at ZIP %s (Yelp ID: %s)",
+                self.stored_count,
+                restaurant_data.get('name', '[unknown]'),
+                restaurant_data.get('zip_code'),
+                restaurant_data.get('yelp_id', 'N/A')
+            )
+        self._buffer.append(restaurant_data)
+        if len(self._buffer) >= self.FLUSH_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Stub batch flush - safely logs what a multi-row insert would store.
+
+        The real implementation would issue a single multi-row insert, e.g.:
+            psycopg2.extras.execute_values(
+                cursor,
+                "INSERT INTO zipbusiness_restaurants (...) VALUES %s "
+                "ON CONFLICT (yelp_id) DO NOTHING",
+                rows, page_size=FLUSH_BATCH_SIZE)
+        so storage costs one round trip per batch instead of one per row.
+        """
+        if not self._buffer:
+            return
+        self.logger.info("[STORE] Would batch-insert %d restaurants", len(self._buffer))
+        self._buffer.clear()
 
 class YelpCityIngestor:
     """Enterprise-grade ZIP-first Yelp restaurant ingestion engine."""
-    
+
     def __init__(self, zip_codes: List[str], ingestion_settings: Dict[str, Any], logger: Optional[logging.Logger] = None):
         """Initialize the ingestor with ZIP codes and settings.
-        
+
         Args:
             zip_codes: List of ZIP codes to ingest (core identifiers)
             ingestion_settings: Configuration dict with:
@@ -39,63 +141,150 @@ class YelpCityIngestor:
                 - restaurants_per_zip: Target restaurants per ZIP (default: 50)
                 - radius_meters: Search radius in meters (default: 5000)
                 - batch_size: Number of businesses per API call (default: 50)
+                - max_concurrent_zips: Concurrent in-flight ZIP tasks (default: 64)
+                - requests_per_sec: Proactive API rate limit (default: 5, Yelp's cap)
+                - max_retries: Retries per call on 429/5xx responses (default: 3)
+                - cache_dir: Directory for cached search responses, or None
+                  to disable caching (default: '.cache/yelp')
+                - cache_ttl_days: Age before a cached response is stale (default: 7)
+                - checkpoint_path: JSONL file recording per-ZIP outcomes;
+                  ZIPs already marked successful there are skipped on
+                  restart. None disables checkpointing (default: None)
+                - extract_workers: Process-pool workers for the CPU-bound
+                  extraction stage; 0 keeps extraction inline (default: 0,
+                  since per-response batches are small and pickling them to
+                  workers only pays off for very large batch sizes)
             logger: Optional logger instance
         """
         self.zip_codes = zip_codes
         self.ingestion_settings = ingestion_settings
         self.logger = logger or logging.getLogger(__name__)
-        
+
         # Initialize results structure
         self.results = {
             'successful_zips': [],
             'failed_zips': [],
             'total_restaurants': 0,
             'errors': [],
-            'ingestion_start': datetime.utcnow().isoformat(),
+            'ingestion_start': datetime.now(timezone.utc).isoformat(),
             'ingestion_end': None,
             'api_calls_made': 0
         }
-        
+
         # Runtime tracking
         self.api_calls_count = 0
-        
+        self._budget_lock: Optional[asyncio.Lock] = None
+        # ZIPs with at least one error record, for O(1) duplicate checks
+        self._errored_zips: set = set()
+        # Failed ZIPs keyed for de-dup (dict keeps insertion order);
+        # converted to the results list when the run finalizes
+        self._failed_zips: Dict[str, None] = {}
+
         # Configuration with defaults
         self.max_api_calls = ingestion_settings.get('max_api_calls', 5000)
         self.restaurants_per_zip = ingestion_settings.get('restaurants_per_zip', 50)
         self.radius_meters = ingestion_settings.get('radius_meters', 5000)
         self.batch_size = min(50, ingestion_settings.get('batch_size', 50))  # Yelp max is 50
+        self.max_concurrent_zips = ingestion_settings.get('max_concurrent_zips', 64)
+        self.max_retries = ingestion_settings.get('max_retries', 3)
+        self.extract_workers = ingestion_settings.get('extract_workers', 0)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Proactive token bucket so concurrent ZIP tasks never exceed Yelp's
+        # per-second quota and trip 429 retry stalls
+        self._limiter = AsyncLimiter(ingestion_settings.get('requests_per_sec', 5), 1)
+
+        # Disk-backed response cache so reruns over the same ZIP/radius/offset
+        # cost zero API calls within the TTL window
+        cache_dir = ingestion_settings.get('cache_dir', '.cache/yelp')
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self._cache_ttl_seconds = ingestion_settings.get('cache_ttl_days', 7) * 86400
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Resume-safe checkpointing: ZIPs recorded as successful in a prior
+        # run are dropped up front so restarts never repeat finished work
+        checkpoint_path = ingestion_settings.get('checkpoint_path')
+        self._checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        done = self._load_checkpoint()
+        if done:
+            self.logger.info("Checkpoint: skipping %d already-ingested ZIPs", len(done))
+            self.zip_codes = [z for z in self.zip_codes if z not in done]
 
     def run(self, yelp_service: YelpService) -> Dict[str, Any]:
         """Execute the ZIP-first ingestion process.
-        
+
+        ZIPs are ingested concurrently (bounded by max_concurrent_zips) so
+        network latency overlaps across ZIPs instead of accumulating serially.
+
         Args:
             yelp_service: Service instance for Yelp API and storage operations
-            
+
         Returns:
             Dict with ingestion results including successful_zips, failed_zips, total_restaurants, errors
         """
-        self.logger.info(f"Starting ZIP-first ingestion for {len(self.zip_codes)} ZIP codes")
-        self.logger.info(f"Settings: max_api_calls={self.max_api_calls}, restaurants_per_zip={self.restaurants_per_zip}, radius={self.radius_meters}m")
+        return asyncio.run(self._run(yelp_service))
+
+    async def _run(self, yelp_service: YelpService) -> Dict[str, Any]:
+        """Async core of run(): fan out ZIP ingestion over a shared HTTP session."""
+        self.logger.info("Starting ZIP-first ingestion for %d ZIP codes", len(self.zip_codes))
+        self.logger.info(
+            "Settings: max_api_calls=%d, restaurants_per_zip=%d, radius=%dm",
+            self.max_api_calls, self.restaurants_per_zip, self.radius_meters
+        )
+
+        self._budget_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(self.max_concurrent_zips)
+
+        if self.extract_workers:
+            self._executor = ProcessPoolExecutor(max_workers=self.extract_workers)
+
+        try:
+            # One shared session for the whole run so connection pooling applies
+            async with aiohttp.ClientSession() as session:
+                if yelp_service.session is None:
+                    yelp_service.session = session
+                await asyncio.gather(*(
+                    self._process_zip(zip_code, zip_index, yelp_service, semaphore)
+                    for zip_index, zip_code in enumerate(self.zip_codes, 1)
+                ))
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        # Flush any restaurants still buffered for batch storage
+        yelp_service.flush()
+
+        # Finalize results
+        self.results['failed_zips'] = list(self._failed_zips)
+        self.results['ingestion_end'] = datetime.now(timezone.utc).isoformat()
+        self.results['api_calls_made'] = self.api_calls_count
 
-        for zip_index, zip_code in enumerate(self.zip_codes, 1):
+        self.logger.info(
+            "Ingestion complete. Success: %d ZIPs, Failed: %d ZIPs, Total restaurants: %d, API calls: %d/%d",
+            len(self.results['successful_zips']),
+            len(self.results['failed_zips']),
+            self.results['total_restaurants'],
+            self.api_calls_count, self.max_api_calls
+        )
+
+        return self.results
+
+    async def _process_zip(self, zip_code: str, zip_index: int, yelp_service: YelpService, semaphore: asyncio.Semaphore) -> None:
+        """Ingest a single ZIP under the concurrency gate and record its outcome."""
+        async with semaphore:
             if self.api_calls_count >= self.max_api_calls:
-                self.logger.warning(f"API call limit ({self.max_api_calls}) reached at ZIP {zip_index}/{len(self.zip_codes)}")
-                remaining_zips = self.zip_codes[zip_index-1:]
-                for remaining_zip in remaining_zips:
-                    self.results['failed_zips'].append(remaining_zip)
-                    self.results['errors'].append({
-                        'zip_code': remaining_zip,
-                        'error': 'API call limit reached',
-                        'type': 'limit_exceeded',
-                        'timestamp': datetime.utcnow().isoformat()
-                    })
-                break
+                self.logger.warning("API call limit (%d) reached; skipping ZIP %s", self.max_api_calls, zip_code)
+                self._failed_zips[zip_code] = None
+                self._record_error(zip_code, 'API call limit reached', 'limit_exceeded')
+                return
+
+            self.logger.info("Processing ZIP %s (%d/%d)", zip_code, zip_index, len(self.zip_codes))
 
-            self.logger.info(f"Processing ZIP {zip_code} ({zip_index}/{len(self.zip_codes)})")
-            
             try:
-                zip_results = self._ingest_zip(zip_code, yelp_service)
-                
+                zip_results = await self._ingest_zip(zip_code, yelp_service)
+
                 if zip_results['restaurant_count'] > 0:
                     self.results['successful_zips'].append({
                         'zip_code': zip_code,
@@ -104,99 +293,204 @@ class YelpCityIngestor:
                         'stored_count': zip_results['stored_count']
                     })
                     self.results['total_restaurants'] += zip_results['restaurant_count']
+                    self._checkpoint(zip_code, 'success', zip_results['restaurant_count'])
                 else:
-                    self.results['failed_zips'].append(zip_code)
-                    if not any(e['zip_code'] == zip_code for e in self.results['errors']):
-                        self.results['errors'].append({
-                            'zip_code': zip_code,
-                            'error': 'No restaurants found in ZIP code area',
-                            'type': 'no_data',
-                            'timestamp': datetime.utcnow().isoformat()
-                        })
+                    self._failed_zips[zip_code] = None
+                    if zip_code not in self._errored_zips:
+                        self._record_error(zip_code, 'No restaurants found in ZIP code area', 'no_data')
+                    self._checkpoint(zip_code, 'failed')
 
             except Exception as zip_error:
-                self.logger.error(f"Critical failure for ZIP {zip_code}: {str(zip_error)}")
-                self.results['failed_zips'].append(zip_code)
-                self.results['errors'].append({
+                self.logger.error("Critical failure for ZIP %s: %s", zip_code, zip_error)
+                self._failed_zips[zip_code] = None
+                self._record_error(zip_code, str(zip_error), 'processing_error')
+                self._checkpoint(zip_code, 'failed')
+
+    def _load_checkpoint(self) -> set:
+        """Return the set of ZIPs a previous run already ingested successfully."""
+        done = set()
+        if self._checkpoint_path is None or not self._checkpoint_path.exists():
+            return done
+        with self._checkpoint_path.open(encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('status') == 'success':
+                    done.add(entry.get('zip_code'))
+        return done
+
+    def _checkpoint(self, zip_code: str, status: str, restaurant_count: int = 0) -> None:
+        """Append one ZIP's outcome to the checkpoint file (best effort)."""
+        if self._checkpoint_path is None:
+            return
+        try:
+            with self._checkpoint_path.open('a', encoding='utf-8') as f:
+                f.write(json.dumps({
                     'zip_code': zip_code,
-                    'error': str(zip_error),
-                    'type': 'processing_error',
-                    'timestamp': datetime.utcnow().isoformat()
-                })
+                    'status': status,
+                    'restaurant_count': restaurant_count,
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                }) + '\n')
+        except OSError:
+            self.logger.debug("Could not write checkpoint for ZIP %s", zip_code)
 
-        # Finalize results
-        self.results['ingestion_end'] = datetime.utcnow().isoformat()
-        self.results['api_calls_made'] = self.api_calls_count
-        
-        self.logger.info(
-            f"Ingestion complete. "
-            f"Success: {len(self.results['successful_zips'])} ZIPs, "
-            f"Failed: {len(self.results['failed_zips'])} ZIPs, "
-            f"Total restaurants: {self.results['total_restaurants']}, "
-            f"API calls: {self.api_calls_count}/{self.max_api_calls}"
-        )
-        
-        return self.results
+    def _record_error(self, zip_code: str, error: str, error_type: str,
+                      timestamp: Optional[str] = None, **extra: Any) -> None:
+        """Append an error record and index its ZIP for O(1) duplicate checks.
+
+        Args:
+            zip_code: The ZIP code the error belongs to
+            error: Human-readable error message
+            error_type: One of the error type tags (api_error, storage_error, ...)
+            timestamp: Optional pre-computed ISO timestamp (e.g. the batch one)
+            **extra: Additional fields to include in the record
+        """
+        entry = {
+            'zip_code': zip_code,
+            'error': error,
+            'type': error_type,
+            'timestamp': timestamp or datetime.now(timezone.utc).isoformat()
+        }
+        entry.update(extra)
+        self.results['errors'].append(entry)
+        self._errored_zips.add(zip_code)
+
+    def _cache_path(self, search_params: Dict[str, Any]) -> Path:
+        """Map a search parameter dict to its cache file path."""
+        key = hashlib.sha1(json.dumps(search_params, sort_keys=True).encode()).hexdigest()
+        return self._cache_dir / f"{key}.json"
+
+    def _cache_get(self, search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached response for these params, or None on miss/stale/disabled."""
+        if self._cache_dir is None:
+            return None
+        path = self._cache_path(search_params)
+        try:
+            if time.time() - path.stat().st_mtime > self._cache_ttl_seconds:
+                return None
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
 
-    def _ingest_zip(self, zip_code: str, yelp_service: YelpService) -> Dict[str, Any]:
+    def _cache_set(self, search_params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """Best-effort write of a response to the disk cache."""
+        if self._cache_dir is None:
+            return
+        try:
+            self._cache_path(search_params).write_text(json.dumps(response), encoding='utf-8')
+        except (OSError, TypeError):
+            self.logger.debug("Could not cache response for params: %s", search_params)
+
+    async def _search_with_limit(self, yelp_service: YelpService, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call search_businesses through the rate limiter, retrying 429/5xx with backoff."""
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            async with self._limiter:
+                try:
+                    return await yelp_service.search_businesses(**search_params)
+                except aiohttp.ClientResponseError as api_error:
+                    if api_error.status not in (429, 500, 502, 503, 504) or attempt == self.max_retries:
+                        raise
+                    # Honor the server's reset hint when it is a plain delay in seconds
+                    retry_after = (api_error.headers or {}).get('Retry-After') or (api_error.headers or {}).get('RateLimit-Reset')
+                    try:
+                        delay = float(retry_after)
+                    except (TypeError, ValueError):
+                        delay = backoff
+                    self.logger.warning(
+                        "Retryable HTTP %d; attempt %d/%d, sleeping %.1fs",
+                        api_error.status, attempt + 1, self.max_retries, delay
+                    )
+                    await asyncio.sleep(delay)
+                    backoff *= 2
+
+    async def _reserve_api_call(self) -> bool:
+        """Atomically claim one API call from the budget. Returns False when exhausted."""
+        async with self._budget_lock:
+            if self.api_calls_count >= self.max_api_calls:
+                return False
+            self.api_calls_count += 1
+            return True
+
+    async def _ingest_zip(self, zip_code: str, yelp_service: YelpService) -> Dict[str, Any]:
         """Ingest restaurants for a single ZIP code.
-        
+
         Args:
             zip_code: The ZIP code to process
             yelp_service: Service instance for API and storage
-            
+
         Returns:
             Dict with restaurant_count, api_calls, stored_count for this ZIP
         """
         offset = 0
-        zip_restaurants = []
+        # Pre-allocate to the known target size; the limit param guarantees
+        # each response adds at most the remaining slots
+        zip_restaurants = [None] * self.restaurants_per_zip
+        found = 0
         zip_api_calls = 0
         stored_count = 0
 
-        while len(zip_restaurants) < self.restaurants_per_zip and self.api_calls_count < self.max_api_calls:
+        while found < self.restaurants_per_zip:
             # Prepare search parameters
             search_params = {
                 'location': zip_code,
                 'categories': 'restaurants',
                 'radius': self.radius_meters,
-                'limit': min(self.batch_size, self.restaurants_per_zip - len(zip_restaurants)),
+                'limit': min(self.batch_size, self.restaurants_per_zip - found),
                 'offset': offset
             }
 
             try:
-                # Make API call
-                response = yelp_service.search_businesses(**search_params)
-                self.api_calls_count += 1
-                zip_api_calls += 1
+                # Serve from the disk cache when possible; only a miss spends
+                # API budget and hits the network
+                response = self._cache_get(search_params)
+                if response is None:
+                    if not await self._reserve_api_call():
+                        break
+                    response = await self._search_with_limit(yelp_service, search_params)
+                    zip_api_calls += 1
+                    self._cache_set(search_params, response)
 
                 # Check for businesses in response
                 businesses = response.get('businesses', [])
                 if not businesses:
-                    self.logger.debug(f"No more businesses for ZIP {zip_code} at offset {offset}")
+                    self.logger.debug("No more businesses for ZIP %s at offset %d", zip_code, offset)
                     break
 
-                # Process each business
-                for business in businesses:
-                    # Strict ZIP code matching - only include if business is actually in target ZIP
-                    business_zip = business.get('location', {}).get('zip_code', '')
-                    if business_zip == zip_code:
-                        restaurant_data = self._extract_restaurant_data(business, zip_code)
-                        zip_restaurants.append(restaurant_data)
-                        
-                        # Attempt to store the restaurant
-                        try:
-                            yelp_service.store_restaurant(restaurant_data)
-                            stored_count += 1
-                        except Exception as store_error:
-                            self.logger.error(f"Storage failed for {restaurant_data.get('name')}: {str(store_error)}")
-                            self.results['errors'].append({
-                                'zip_code': zip_code,
-                                'restaurant': restaurant_data.get('name'),
-                                'yelp_id': restaurant_data.get('yelp_id'),
-                                'error': str(store_error),
-                                'type': 'storage_error',
-                                'timestamp': datetime.utcnow().isoformat()
-                            })
+                # One timestamp per batch - every business from this response
+                # shares it, instead of paying datetime formatting per record
+                batch_ts = datetime.now(timezone.utc).isoformat()
+
+                # Extract the batch, off the event loop when a worker pool is
+                # configured so CPU-bound extraction doesn't block I/O tasks
+                if self._executor is not None:
+                    extracted = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, _extract_zip_batch, businesses, zip_code, batch_ts
+                    )
+                else:
+                    extracted = _extract_zip_batch(businesses, zip_code, batch_ts)
+
+                for restaurant_data in extracted:
+                    zip_restaurants[found] = restaurant_data
+                    found += 1
+
+                    # Attempt to store the restaurant
+                    try:
+                        yelp_service.store_restaurant(restaurant_data)
+                        stored_count += 1
+                    except Exception as store_error:
+                        self.logger.error("Storage failed for %s: %s", restaurant_data.get('name'), store_error)
+                        self._record_error(
+                            zip_code, str(store_error), 'storage_error',
+                            timestamp=batch_ts,
+                            restaurant=restaurant_data.get('name'),
+                            yelp_id=restaurant_data.get('yelp_id')
+                        )
 
                 # Update offset for pagination
                 offset += len(businesses)
@@ -204,63 +498,28 @@ class YelpCityIngestor:
                 # Check if we've retrieved all available results
                 total_available = response.get('total', 0)
                 if total_available <= offset:
-                    self.logger.debug(f"Retrieved all {total_available} results for ZIP {zip_code}")
+                    self.logger.debug("Retrieved all %d results for ZIP %s", total_available, zip_code)
                     break
 
             except Exception as api_error:
-                self.logger.error(f"API error for ZIP {zip_code}: {str(api_error)}")
-                self.results['errors'].append({
-                    'zip_code': zip_code,
-                    'error': str(api_error),
-                    'type': 'api_error',
-                    'timestamp': datetime.utcnow().isoformat()
-                })
+                self.logger.error("API error for ZIP %s: %s", zip_code, api_error)
+                self._record_error(zip_code, str(api_error), 'api_error')
                 break
 
+        # Trim unused pre-allocated slots
+        del zip_restaurants[found:]
+
         self.logger.info(
-            f"ZIP {zip_code} complete: {len(zip_restaurants)} restaurants found, "
-            f"{stored_count} stored, {zip_api_calls} API calls"
+            "ZIP %s complete: %d restaurants found, %d stored, %d API calls",
+            zip_code, found, stored_count, zip_api_calls
         )
 
         return {
-            'restaurant_count': len(zip_restaurants),
+            'restaurant_count': found,
             'api_calls': zip_api_calls,
             'stored_count': stored_count
         }
 
-    def _extract_restaurant_data(self, business: Dict[str, Any], zip_code: str) -> Dict[str, Any]:
-        """Extract and structure restaurant data from Yelp business object.
-        
-        Args:
-            business: Raw business data from Yelp API
-            zip_code: The ZIP code being processed (for validation)
-            
-        Returns:
-            Structured restaurant data dict
-        """
-        location = business.get('location', {})
-        coordinates = business.get('coordinates', {})
-        
-        return {
-            'yelp_id': business.get('id'),
-            'name': business.get('name'),
-            'address': location.get('address1'),
-            'city': location.get('city'),
-            'state': location.get('state'),
-            'zip_code': zip_code,  # Use the target ZIP to ensure consistency
-            'latitude': coordinates.get('latitude'),
-            'longitude': coordinates.get('longitude'),
-            'phone': business.get('phone'),
-            'rating': business.get('rating'),
-            'review_count': business.get('review_count'),
-            'price': business.get('price'),
-            'categories': [cat.get('alias') for cat in business.get('categories', []) if cat.get('alias')],
-            'image_url': business.get('image_url'),
-            'url': business.get('url'),
-            'is_closed': business.get('is_closed', False),
-            'transactions': business.get('transactions', []),
-            'ingested_at': datetime.utcnow().isoformat()
-        }
 
 
 # Example usage (for testing/demonstration purposes only)
@@ -270,7 +529,7 @@ if __name__ == "__main__":
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
+
     # Example ZIP codes and settings
     test_zips = ['10001', '10002', '10003']
     settings = {
@@ -278,18 +537,18 @@ if __name__ == "__main__":
         'restaurants_per_zip': 25,
         'radius_meters': 3000
     }
-    
+
     # Create service and ingestor
     yelp_service = YelpService()
     ingestor = YelpCityIngestor(test_zips, settings)
-    
+
     # Run ingestion
     results = ingestor.run(yelp_service)
-    
+
     # Display results
     print(f"\nIngestion Results:")
     print(f"- Successful ZIPs: {len(results['successful_zips'])}")
     print(f"- Failed ZIPs: {len(results['failed_zips'])}")
     print(f"- Total restaurants: {results['total_restaurants']}")
     print(f"- Errors: {len(results['errors'])}")
-    print(f"- API calls made: {results['api_calls_made']}")
\ No newline at end of file
+    print(f"- API calls made: {results['api_calls_made']}")
@@ -7,7 +7,8 @@ Checks database connectivity and verifies zipbusiness_restaurants table exists
 import os
 import sys
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import NamedTupleCursor
+from psycopg2.pool import ThreadedConnectionPool
 from urllib.parse import urlparse
 from datetime import datetime
 
@@ -29,41 +30,39 @@ class DatabaseConnectionChecker:
             'user': parsed.username,
             'password': parsed.password
         }
-        
+
+        # Pool is created lazily so construction never blocks on the network
+        self._pool = None
+
+    def _get_pool(self):
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(minconn=1, maxconn=10, **self.connection_params)
+        return self._pool
+
     def check_connection(self):
         """Test database connectivity"""
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            conn.close()
+            conn = self._get_pool().getconn()
+            self._pool.putconn(conn)
             return True
         except psycopg2.Error as e:
             print(f"❌ Failed to connect to database: {e}")
             return False
-    
+
     def verify_table_schema(self):
         """Check if zipbusiness_restaurants table exists and inspect schema"""
         conn = None
         cursor = None
-        
+
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Check if table exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'zipbusiness_restaurants'
-                );
-            """)
-            
-            table_exists = cursor.fetchone()['exists']
-            
-            if not table_exists:
-                raise RuntimeError("Table 'zipbusiness_restaurants' does not exist in the database")
-            
-            # Fetch column information
+            conn = self._get_pool().getconn()
+            # NamedTupleCursor keeps readable column access without building
+            # a dict per row like RealDictCursor does
+            cursor = conn.cursor(cursor_factory=NamedTupleCursor)
+
+            # Fetch column information; zero rows doubles as the
+            # "table does not exist" signal, saving a round trip
             cursor.execute("""
                 SELECT 
                     column_name,
@@ -80,17 +79,26 @@ class DatabaseConnectionChecker:
             """)
             
             columns = cursor.fetchall()
-            
+
+            if not columns:
+                raise RuntimeError("Table 'zipbusiness_restaurants' does not exist in the database")
+
             return True, columns
-            
+
         except psycopg2.Error as e:
             return False, str(e)
         finally:
             if cursor:
                 cursor.close()
             if conn:
-                conn.close()
-    
+                self._pool.putconn(conn)
+
+    def close(self):
+        """Release all pooled connections"""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+
     def format_column_info(self, columns):
         """Format column information for display"""
         print("\n📋 Table Schema: zipbusiness_restaurants")
@@ -100,23 +108,23 @@ class DatabaseConnectionChecker:
         
         for col in columns:
             # Format data type with precision/scale if applicable
-            data_type = col['data_type']
-            if col['character_maximum_length']:
-                data_type = f"{data_type}({col['character_maximum_length']})"
-            elif col['numeric_precision'] and col['numeric_scale']:
-                data_type = f"{data_type}({col['numeric_precision']},{col['numeric_scale']})"
-            elif col['numeric_precision']:
-                data_type = f"{data_type}({col['numeric_precision']})"
-            
+            data_type = col.data_type
+            if col.character_maximum_length:
+                data_type = f"{data_type}({col.character_maximum_length})"
+            elif col.numeric_precision and col.numeric_scale:
+                data_type = f"{data_type}({col.numeric_precision},{col.numeric_scale})"
+            elif col.numeric_precision:
+                data_type = f"{data_type}({col.numeric_precision})"
+
             # Format nullable
-            nullable = "YES" if col['is_nullable'] == 'YES' else "NO"
-            
+            nullable = "YES" if col.is_nullable == 'YES' else "NO"
+
             # Format default value
-            default = col['column_default'] or '-'
+            default = col.column_default or '-'
             if len(default) > 20:
                 default = default[:17] + "..."
-            
-            print(f"{col['column_name']:<25} {data_type:<20} {nullable:<10} {default:<20}")
+
+            print(f"{col.column_name:<25} {data_type:<20} {nullable:<10} {default:<20}")
         
         print("=" * 80)
         print(f"Total columns: {len(columns)}")
@@ -150,7 +158,8 @@ def main():
             sys.exit(1)
         
         print("\n✅ Database verification completed successfully")
-        
+        checker.close()
+
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
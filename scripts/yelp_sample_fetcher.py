@@ -10,6 +10,7 @@ from datetime import datetime
 from pathlib import Path
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 # Add parent directory to path for imports
@@ -31,6 +32,14 @@ SEARCH_PARAMS = {
     "limit": 20
 }
 
+# Module-level client so repeated fetches reuse keep-alive connections
+# instead of paying a fresh TCP + TLS handshake per call
+_CLIENT = httpx.Client(
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+    headers={"Accept": "application/json"}
+)
+
 
 class YelpAPIError(Exception):
     """Custom exception for Yelp API errors."""
@@ -51,40 +60,37 @@ def fetch_yelp_businesses(api_key: str, params: dict) -> dict:
     Raises:
         YelpAPIError: On API authentication or request errors
     """
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Accept": "application/json"
-    }
-    
+    headers = {"Authorization": f"Bearer {api_key}"}
+
     url = f"{YELP_API_BASE_URL}/businesses/search"
-    
+
     print(f"[{datetime.now().isoformat()}] Initiating Yelp API request...")
     print(f"URL: {url}")
     print(f"Parameters: {json.dumps(params, indent=2)}")
-    
+
     try:
-        with httpx.Client() as client:
-            response = client.get(url, headers=headers, params=params, timeout=30.0)
-            
-            # Check for authentication errors
-            if response.status_code == 401:
-                raise YelpAPIError("Authentication failed. Please check your YELP_API_KEY.")
-            
-            # Check for rate limit errors
-            if response.status_code == 429:
-                raise YelpAPIError("API rate limit exceeded. Please try again later.")
-            
-            # Check for other HTTP errors
-            response.raise_for_status()
-            
-            print(f"[{datetime.now().isoformat()}] Request successful. Status: {response.status_code}")
-            return response.json()
-            
+        response = _CLIENT.get(url, headers=headers, params=params)
+
+        # Check for authentication errors
+        if response.status_code == 401:
+            raise YelpAPIError("Authentication failed. Please check your YELP_API_KEY.")
+
+        # Check for rate limit errors
+        if response.status_code == 429:
+            raise YelpAPIError("API rate limit exceeded. Please try again later.")
+
+        # Check for other HTTP errors
+        response.raise_for_status()
+
+        print(f"[{datetime.now().isoformat()}] Request successful. Status: {response.status_code}")
+        # orjson parses the raw bytes several times faster than the stdlib
+        # json.loads that response.json() would use
+        return orjson.loads(response.content)
+
     except httpx.HTTPStatusError as e:
-        error_detail = ""
         try:
-            error_detail = e.response.json()
-        except:
+            error_detail = orjson.loads(e.response.content)
+        except orjson.JSONDecodeError:
             error_detail = e.response.text
         raise YelpAPIError(f"HTTP error {e.response.status_code}: {error_detail}")
     except httpx.RequestError as e:
@@ -135,9 +141,11 @@ def save_response(data: dict, filename: str) -> None:
         data: The API response data
         filename: Output filename
     """
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
+    # orjson serializes straight to bytes, skipping the intermediate
+    # pretty-printed Python string stdlib json would build
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
     print(f"\n[{datetime.now().isoformat()}] Response saved to: {filename}")
 
 
@@ -161,11 +169,13 @@ def main():
         # Fetch data from Yelp
         response_data = fetch_yelp_businesses(YELP_API_KEY, SEARCH_PARAMS)
         
-        # Log full JSON response
+        # Log full JSON response (write bytes directly, no str round trip)
         print("\n" + "="*80)
         print("FULL JSON RESPONSE")
         print("="*80)
-        print(json.dumps(response_data, indent=2, ensure_ascii=False))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(response_data, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
         
         # Analyze response structure
         analyze_response_structure(response_data)
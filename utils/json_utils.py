@@ -1,58 +1,86 @@
 """JSON utility functions for the Zip Intelligence API."""
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+
+def _walk(data: Union[Dict, List], parent_key: str = '', separator: str = '.') -> Iterator[Tuple[str, Any]]:
+    """
+    Walk a nested JSON structure iteratively, yielding (path, value) pairs.
+
+    Uses an explicit stack instead of recursion, so no intermediate dicts
+    are built at each nesting level and arbitrarily deep structures cannot
+    hit the recursion limit.
+
+    Args:
+        data: The JSON data to walk (dict or list)
+        parent_key: The base key for nested fields
+        separator: The separator for nested keys (default: '.')
+
+    Yields:
+        (path, value) tuples for every leaf value, in document order
+    """
+    stack = [(data, parent_key)]
+
+    while stack:
+        node, prefix = stack.pop()
+
+        if isinstance(node, dict):
+            # Push in reverse so pops come back in document order
+            for key, value in reversed(node.items()):
+                new_key = f"{prefix}{separator}{key}" if prefix else key
+                stack.append((value, new_key))
+        elif isinstance(node, list):
+            for i in range(len(node) - 1, -1, -1):
+                array_key = f"{prefix}[{i}]" if prefix else f"[{i}]"
+                stack.append((node[i], array_key))
+        else:
+            yield prefix, node
 
 
 def flatten_json(data: Union[Dict, List], parent_key: str = '', separator: str = '.') -> Dict[str, Any]:
     """
     Flatten a nested JSON structure into dot notation.
-    
+
     Args:
         data: The JSON data to flatten (dict or list)
         parent_key: The base key for nested fields
         separator: The separator for nested keys (default: '.')
-        
+
     Returns:
         A dictionary with flattened keys in dot notation
     """
-    items = []
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            new_key = f"{parent_key}{separator}{key}" if parent_key else key
-            
-            if isinstance(value, dict):
-                items.extend(flatten_json(value, new_key, separator).items())
-            elif isinstance(value, list):
-                for i, item in enumerate(value):
-                    array_key = f"{new_key}[{i}]"
-                    if isinstance(item, (dict, list)):
-                        items.extend(flatten_json(item, array_key, separator).items())
-                    else:
-                        items.append((array_key, item))
-            else:
-                items.append((new_key, value))
-                
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            array_key = f"{parent_key}[{i}]" if parent_key else f"[{i}]"
-            if isinstance(item, (dict, list)):
-                items.extend(flatten_json(item, array_key, separator).items())
-            else:
-                items.append((array_key, item))
-    
-    return dict(items)
+    if not isinstance(data, (dict, list)):
+        return {}
+
+    return dict(_walk(data, parent_key, separator))
+
+
+def _paths(data: Union[Dict, List], prefix: str = '') -> Iterator[str]:
+    """
+    Yield the dot-notation path of every leaf value, without keeping values.
+
+    Args:
+        data: The JSON data to walk
+        prefix: The base key for nested fields
+
+    Yields:
+        Path strings for every leaf value, in document order
+    """
+    for path, _ in _walk(data, prefix):
+        yield path
 
 
 def get_field_paths(data: Union[Dict, List]) -> List[str]:
     """
     Extract all field paths from a JSON structure.
-    
+
     Args:
         data: The JSON data to analyze
-        
+
     Returns:
         A sorted list of all field paths in dot notation
     """
-    flattened = flatten_json(data)
-    return sorted(flattened.keys())
\ No newline at end of file
+    if not isinstance(data, (dict, list)):
+        return []
+
+    return sorted(set(_paths(data)))
\ No newline at end of file